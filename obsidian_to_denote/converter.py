@@ -6,16 +6,194 @@ Converts Obsidian markdown files to Denote format (org-mode or markdown)
 
 import os
 import re
+import sys
 import argparse
+import traceback
 from datetime import datetime
 from pathlib import Path
-import yaml
 import unicodedata
 import shutil
+import tempfile
 import hashlib
+import functools
+import itertools
+import logging
+
+# Named explicitly so messages stay under the package logger when run with -m
+logger = logging.getLogger('obsidian_to_denote.converter')
+_log_handler = None  # Stderr handler installed by _configure_logging
+
+# The process umask, for giving atomically written files the usual permissions
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Without verbose output, report directory progress every this many files
+_PROGRESS_INTERVAL = 100
+
+# Precompiled patterns used on the conversion hot path
+_FRONTMATTER = re.compile(r'\A---\n(.*?)\n---\n', re.DOTALL)
+_SLUG_NONWORD = re.compile(r'[^\w\s-]')
+_SLUG_SPACES = re.compile(r'[-\s]+')
+_HEADING = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_INLINE_TAG = re.compile(r'#(\w+)')
+_WIKILINK = re.compile(r'\[\[([^\]]+)\]\]')
+# Obsidian embeds: ![[file.pdf]], ![[image.png]]
+_EMBED = re.compile(r'!\[\[([^\]]+)\]\]')
+# Standard markdown images: ![alt](path/to/image.png)
+_MD_IMG = re.compile(r'!\[([^\]]*)\]\(([^)]+)\)')
+# Obsidian attachments: [[file.pdf]]
+_ATTACH = re.compile(
+    r'(?<!\!)\[\[([^\]|]+\.(?:pdf|docx?|xlsx?|pptx?|zip|mp4|mp3|wav)(?:\|[^\]]+)?)\]\]'
+)
+
+# Fenced code blocks, including an unterminated block running to end of file
+_FENCED_CODE = re.compile(
+    r'(^```[^\n]*(?:\n.*?^```[^\n]*$|.*\Z))', re.MULTILINE | re.DOTALL
+)
+# Markdown -> org-mode conversions, applied in a single scan outside code blocks
+_MD_INLINE = re.compile(
+    r'^(?P<level>#+)(?P<heading>[^\n]*)'  # Headers
+    r'|^(?P<ul>[^\S\n]*)[-*+][^\S\n](?:\[(?P<check>[ x])\][^\S\n])?'  # Lists, checkboxes
+    r'|^(?P<ol>[^\S\n]*)(?P<num>\d+)\.[^\S\n]'  # Ordered lists
+    r'|(?P<bold>\*\*|__)(?P<bold_text>.+?)(?P=bold)'  # Bold
+    r'|(?P<ital>\*|_)(?P<ital_text>.+?)(?P=ital)'  # Italic
+    r'|~~(?P<strike>.+?)~~'  # Strikethrough
+    r'|`(?P<code>[^`\n]+)`',  # Inline code, never across lines
+    re.MULTILINE,
+)
+
+# Output templates for wiki-links and asset references, by output format
+_LINK_TEMPLATES = {
+    'org': '[[file:{link}.org][{desc}]]',
+    'md': '[{desc}]({link}.md)',
+}
+_ASSET_TEMPLATES = {
+    'org': {
+        'embed': '[[file:{path}]]',
+        'image': '[[file:{path}]]',
+        'attachment': '[[file:{path}][{desc}]]',
+    },
+    'md': {
+        'embed': '![{desc}]({path})',
+        'image': '![{desc}]({path})',
+        'attachment': '[{desc}]({path})',
+    },
+}
+
+# Folders Obsidian vaults commonly keep attachments in, relative to the vault
+# root ('' is the root itself) and to the note's own directory
+_VAULT_ASSET_SUBDIRS = (
+    '', 'attachments', 'Attachments', 'assets', 'Assets', 'images', 'Images', 'Files'
+)
+_LOCAL_ASSET_SUBDIRS = ('attachments', 'assets')
+# Embeds with these extensions are assets; anything else is a note reference
+_ASSET_EXTS = (
+    '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.pdf',
+    '.mp4', '.mp3', '.wav', '.mov', '.docx', '.xlsx', '.pptx',
+)
+
+def _configure_logging(level):
+    """Send this package's log messages to stderr at the given level
+    
+    Only the package logger is touched, so other libraries keep their own levels.
+    """
+    global _log_handler
+    package_logger = logging.getLogger('obsidian_to_denote')
+    if _log_handler is not None:
+        package_logger.removeHandler(_log_handler)
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter('%(message)s'))
+    package_logger.addHandler(_log_handler)
+    package_logger.setLevel(level)
+
+def _hash_file(path):
+    """Return a short BLAKE2b digest of a file's contents"""
+    digest = hashlib.blake2b(digest_size=8)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+def _write_if_changed(path, data):
+    """Atomically write bytes to path unless it already holds exactly them"""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    # A unique temporary name, so concurrent writers never share one
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        # mkstemp creates files private to the user; give them normal permissions
+        os.chmod(tmp_name, 0o666 & ~_UMASK)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+def _repoint_assets(path, renamed):
+    """Rewrite asset references in a converted note using an old -> new path map"""
+    text = path.read_text(encoding='utf-8')
+    for old, new in renamed.items():
+        text = text.replace(old, new)
+    _write_if_changed(path, text.encode('utf-8'))
+
+@functools.lru_cache(maxsize=None)
+def _yaml_loader():
+    """Import PyYAML on first use and return (yaml, fastest safe loader)
+    
+    Deferred so that --help and argument errors don't pay for the import.
+    """
+    import yaml
+    # Prefer the libyaml-backed loader; frontmatter parsing dominates run time
+    return yaml, getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def _read_text(path):
+    """Read a UTF-8 text file with universal newlines, in a single read"""
+    text = Path(path).read_bytes().decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+def _iter_markdown_files(root):
+    """Yield every .md file under root, walking the tree with os.scandir"""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.name.endswith('.md') and entry.is_file():
+                        yield Path(entry.path)
+        except OSError:
+            # Unreadable directories are skipped, as Path.glob does
+            continue
+        # Visit subdirectories depth-first, in directory order
+        pending.extend(reversed(subdirs))
+
+@functools.lru_cache(maxsize=8192)
+def _slugify_cached(text):
+    """Slugify text; cached since the same tags recur across a vault"""
+    # Remove non-ASCII characters (most titles and tags are already ASCII)
+    if not text.isascii():
+        text = unicodedata.normalize('NFKD', text)
+        text = text.encode('ascii', 'ignore').decode('ascii')
+    # Replace spaces and special chars with hyphens
+    text = _SLUG_NONWORD.sub('', text.lower())
+    text = _SLUG_SPACES.sub('-', text)
+    result = text.strip('-')
+    
+    # Return a default if the result is empty
+    return result if result else 'untitled'
 
 class ObsidianToDenoteConverter:
-    def __init__(self, output_format='org', preserve_links=True, assets_handling='copy'):
+    def __init__(self, output_format='org', preserve_links=True, assets_handling='copy',
+                 verbose=False):
         """
         Initialize converter
         
@@ -26,13 +204,22 @@ class ObsidianToDenoteConverter:
                 - 'copy': Copy assets to output directory
                 - 'link': Keep original paths (absolute or relative)
                 - 'ignore': Don't process assets
+            verbose: Report every converted file rather than periodic progress
+                (per-asset details are logged at DEBUG level)
         """
         self.output_format = output_format
         self.preserve_links = preserve_links
         self.assets_handling = assets_handling
+        self.verbose = verbose
         self.file_mapping = {}  # Track old -> new filename mappings
+        self._stem_map = {}  # Old stem -> new stem, for wiki-link lookups
+        self._stem_sources = {}  # Old stem -> input path whose name it maps to
         self.asset_mapping = {}  # Track asset file mappings
         self.assets_dir = 'assets'  # Subdirectory for assets
+        self._pending_copies = None  # Assets left for the parent process to copy
+        self._asset_index = {}  # Vault root -> {lowercase filename: [paths]}
+        self._content_hash_to_dest = {}  # (assets dir, content digest) -> copied path
+        self._vault_root_cache = {}  # Source directory -> vault root
         
     def slugify(self, text):
         """Convert text to valid Denote slug format"""
@@ -41,47 +228,40 @@ class ObsidianToDenoteConverter:
             return 'untitled'
         
         # Convert to string if not already
-        text = str(text)
-        
-        # Remove non-ASCII characters
-        text = unicodedata.normalize('NFKD', text)
-        text = text.encode('ascii', 'ignore').decode('ascii')
-        # Replace spaces and special chars with hyphens
-        text = re.sub(r'[^\w\s-]', '', text.lower())
-        text = re.sub(r'[-\s]+', '-', text)
-        result = text.strip('-')
-        
-        # Return a default if the result is empty
-        return result if result else 'untitled'
+        return _slugify_cached(str(text))
     
     def extract_yaml_frontmatter(self, content):
         """Extract YAML frontmatter and return metadata + remaining content"""
-        metadata = {}
-        remaining_content = content
-        
-        if content.startswith('---\n'):
+        match = _FRONTMATTER.match(content)
+        if match:
+            yaml, loader = _yaml_loader()
             try:
-                end_idx = content.index('\n---\n', 4)
-                yaml_content = content[4:end_idx]
-                metadata = yaml.safe_load(yaml_content)
-                remaining_content = content[end_idx + 5:]
-            except (ValueError, yaml.YAMLError):
+                return yaml.load(match.group(1), Loader=loader), content[match.end():]
+            except yaml.YAMLError:
                 pass
-                
-        return metadata, remaining_content
+        
+        return {}, content
     
     def generate_denote_filename(self, original_path, metadata, content):
-        """Generate Denote-style filename"""
-        # Get creation time (use file mtime or metadata)
-        file_stat = os.stat(original_path)
-        created_time = datetime.fromtimestamp(file_stat.st_mtime)
+        """Generate Denote-style filename
         
+        Args:
+            original_path: Path to the original file
+            metadata: Parsed frontmatter (may be None)
+            content: File content without frontmatter
+        """
+        # Get creation time (use metadata, falling back to file mtime)
+        created_time = None
         if metadata and 'created' in metadata:
             try:
                 created_time = datetime.fromisoformat(str(metadata['created']))
             except:
                 pass
         
+        if created_time is None:
+            # Only stat the file when the frontmatter gives no usable date
+            created_time = datetime.fromtimestamp(os.stat(original_path).st_mtime)
+        
         # Format timestamp
         timestamp = created_time.strftime('%Y%m%dT%H%M%S')
         
@@ -103,7 +283,7 @@ class ObsidianToDenoteConverter:
         # AND the filename is generic (like "Untitled" or similar)
         generic_filenames = ['untitled', 'new note', 'new-note', 'document']
         if title.lower() in generic_filenames and content:
-            heading_match = re.search(r'^#\s+(.+)$', content, re.MULTILINE)
+            heading_match = _HEADING.search(content)
             if heading_match:
                 title = heading_match.group(1)
         
@@ -123,11 +303,11 @@ class ObsidianToDenoteConverter:
         
         # Also extract inline tags from content
         if content:
-            inline_tags = re.findall(r'#(\w+)', content)
+            inline_tags = _INLINE_TAG.findall(content)
             tags.extend(inline_tags)
         
-        # Remove duplicates and filter out None/empty values
-        tags = list(set(tag for tag in tags if tag))
+        # Remove duplicates (keeping first-seen order) and filter out None/empty values
+        tags = list(dict.fromkeys(tag for tag in tags if tag))
         
         # Build filename
         if tags:
@@ -140,65 +320,72 @@ class ObsidianToDenoteConverter:
         
         return filename, title, tags, created_time
     
+    def _map_stem(self, input_path, denote_filename):
+        """Point wiki-links to input_path's stem at its Denote filename
+        
+        The first file seen with a given stem keeps the link; converting
+        that file again updates it to the new name.
+        """
+        input_path = Path(input_path)
+        stem = input_path.stem
+        if self._stem_sources.setdefault(stem, input_path) == input_path:
+            self._stem_map[stem] = Path(denote_filename).stem
+    
     def convert_links(self, content, is_org=False):
         """Convert Obsidian wiki-links to appropriate format"""
+        # Every pattern below needs a '[['; skip the scans for link-free notes
+        if '[[' not in content:
+            return content
+        
         if is_org:
             # Convert [[link]] to [[file:link.org][link]] for org-mode
-            def replace_link(match):
-                link_text = match.group(1)
-                if '|' in link_text:
-                    link, desc = link_text.split('|', 1)
-                else:
-                    link = desc = link_text
-                
-                # Check if link is in our file mapping
-                for old_name, new_name in self.file_mapping.items():
-                    if Path(old_name).stem == link:
-                        link = Path(new_name).stem
-                        break
-                
-                return f"[[file:{link}.org][{desc}]]"
-            
-            content = re.sub(r'\[\[([^\]]+)\]\]', replace_link, content)
-            
-            # Convert embedded images/files
-            content = re.sub(r'!\[\[([^\]]+)\]\]', r'[[file:\1]]', content)
-            
+            link_format = _LINK_TEMPLATES['org'].format
         elif not self.preserve_links:
             # Convert wiki-links to standard markdown links
-            def replace_link(match):
-                link_text = match.group(1)
-                if '|' in link_text:
-                    link, desc = link_text.split('|', 1)
-                else:
-                    link = desc = link_text
-                    
-                # Check if link is in our file mapping
-                for old_name, new_name in self.file_mapping.items():
-                    if Path(old_name).stem == link:
-                        link = Path(new_name).stem
-                        break
-                        
-                return f"[{desc}]({link}.md)"
+            link_format = _LINK_TEMPLATES['md'].format
+        else:
+            return content
+        
+        def replace_link(match):
+            link_text = match.group(1)
+            if '|' in link_text:
+                link, desc = link_text.split('|', 1)
+            else:
+                link = desc = link_text
             
-            content = re.sub(r'\[\[([^\]]+)\]\]', replace_link, content)
+            # Check if link is in our file mapping
+            link = self._stem_map.get(link, link)
             
+            return link_format(link=link, desc=desc)
+        
+        content = _WIKILINK.sub(replace_link, content)
+        
+        if is_org:
+            # Convert embedded images/files
+            content = _EMBED.sub(r'[[file:\1]]', content)
+        
         return content
     
     def find_asset(self, file_ref, source_dir):
         """Find asset file in vault (handles Obsidian's asset resolution)"""
         # Get the vault root (assuming we're converting from a vault)
         current_dir = Path(source_dir)
-        vault_root = current_dir
         
-        # Find vault root by looking for .obsidian folder
-        while vault_root.parent != vault_root:
-            if (vault_root / '.obsidian').exists():
-                break
-            vault_root = vault_root.parent
+        if current_dir in self._vault_root_cache:
+            vault_root = self._vault_root_cache[current_dir]
         else:
-            # If no .obsidian found, use the input directory as root
             vault_root = current_dir
+            
+            # Find vault root by looking for .obsidian folder
+            while vault_root.parent != vault_root:
+                if (vault_root / '.obsidian').exists():
+                    break
+                vault_root = vault_root.parent
+            else:
+                # If no .obsidian found, use the input directory as root
+                vault_root = current_dir
+            
+            self._vault_root_cache[current_dir] = vault_root
         
         # Remove any alias from reference
         if '|' in file_ref:
@@ -207,103 +394,111 @@ class ObsidianToDenoteConverter:
         # Clean the reference
         file_ref = file_ref.strip()
         
-        # Try different locations where Obsidian might store assets
-        possible_paths = [
-            current_dir / file_ref,  # Relative to current file's directory
-            vault_root / file_ref,  # Relative to vault root
-            vault_root / 'attachments' / file_ref,  # Common attachments folder
-            vault_root / 'Attachments' / file_ref,  # Case variation
-            vault_root / 'assets' / file_ref,  # Common assets folder
-            vault_root / 'Assets' / file_ref,  # Case variation
-            vault_root / 'images' / file_ref,  # Common images folder
-            vault_root / 'Images' / file_ref,  # Case variation
-            vault_root / 'Files' / file_ref,  # Another common folder
-            current_dir / 'attachments' / file_ref,  # Local attachments
-            current_dir / 'assets' / file_ref,  # Local assets
-        ]
-        
-        # Check each possible path
-        for path in possible_paths:
-            if path.exists() and path.is_file():
-                print(f"  Found asset: {file_ref} at {path}")
-                return path
+        # Try different locations where Obsidian might store assets, building
+        # each path only when the previous one didn't exist
+        possible_paths = itertools.chain(
+            (current_dir / file_ref,),  # Relative to current file's directory
+            (vault_root / subdir / file_ref for subdir in _VAULT_ASSET_SUBDIRS),
+            (current_dir / subdir / file_ref for subdir in _LOCAL_ASSET_SUBDIRS),
+        )
         
-        # Last resort: search entire vault for the filename
-        search_name = Path(file_ref).name
-        print(f"  Searching vault for: {search_name}")
-        for path in vault_root.rglob(search_name):
+        # Check each possible path (is_file() is False for missing paths)
+        for path in possible_paths:
             if path.is_file():
-                print(f"  Found asset via search: {file_ref} at {path}")
+                logger.debug("  Found asset: %s at %s", file_ref, path)
                 return path
         
-        print(f"  Asset NOT found: {file_ref}")
+        # Last resort: search entire vault for the filename, preferring an exact match
+        search_name = Path(file_ref).name
+        logger.debug("  Searching vault for: %s", search_name)
+        matches = self.get_asset_index(vault_root).get(search_name.lower())
+        if matches:
+            path = next((match for match in matches if match.name == search_name), matches[0])
+            logger.debug("  Found asset via search: %s at %s", file_ref, path)
+            return path
+        
+        logger.debug("  Asset NOT found: %s", file_ref)
         return None
     
+    def get_asset_index(self, vault_root):
+        """Index every file in the vault by lowercase filename (built once per vault)"""
+        index = self._asset_index.get(vault_root)
+        if index is None:
+            index = {}
+            for dirpath, _, filenames in os.walk(vault_root):
+                for filename in filenames:
+                    index.setdefault(filename.lower(), []).append(Path(dirpath) / filename)
+            self._asset_index[vault_root] = index
+        return index
+    
     def copy_asset(self, asset_path, output_dir):
         """Copy asset to output directory and return relative path"""
-        assets_dir = Path(output_dir) / self.assets_dir
-        
-        # Generate unique filename to avoid conflicts
-        hash_suffix = hashlib.md5(str(asset_path).encode()).hexdigest()[:8]
-        new_name = f"{asset_path.stem}_{hash_suffix}{asset_path.suffix}"
-        
-        dest_path = assets_dir / new_name
-        
-        # Copy file if not already copied
         if str(asset_path) not in self.asset_mapping:
-            shutil.copy2(asset_path, dest_path)
+            # Name copies by content so duplicated attachments are only copied once
+            assets_dir = Path(output_dir) / self.assets_dir
+            key = (assets_dir, _hash_file(asset_path))
+            dest_path = self._content_hash_to_dest.get(key)
+            if dest_path is None:
+                new_name = f"{asset_path.stem}_{key[1].hex()}{asset_path.suffix}"
+                dest_path = assets_dir / new_name
+                self._copy_asset_file(asset_path, dest_path, key[1])
+                self._content_hash_to_dest[key] = dest_path
             self.asset_mapping[str(asset_path)] = str(dest_path.relative_to(output_dir))
-            print(f"  Copied asset: {asset_path.name} -> {dest_path.name}")
         
         return self.asset_mapping[str(asset_path)]
     
+    def _copy_asset_file(self, asset_path, dest_path, digest):
+        """Copy asset contents (not metadata), or defer the copy in a worker process"""
+        if self._pending_copies is not None:
+            # Worker process: the parent does the copy to avoid write races
+            self._pending_copies.append((asset_path, dest_path, digest))
+        else:
+            shutil.copyfile(asset_path, dest_path)
+            logger.debug("  Copied asset: %s -> %s", asset_path.name, dest_path.name)
+    
     def process_assets(self, content, source_dir, output_dir, is_org=False):
         """Process and copy referenced assets (images, PDFs, etc.)"""
         if self.assets_handling == 'ignore':
             return content
         
+        # Every pattern below needs a '[[' or '!['; skip the scans when neither occurs
+        if '[[' not in content and '![' not in content:
+            return content
+        
         # Create assets directory if copying
         if self.assets_handling == 'copy':
             assets_path = Path(output_dir) / self.assets_dir
             assets_path.mkdir(exist_ok=True)
         
-        # Find all embedded files and links
-        # Obsidian embeds: ![[file.pdf]], ![[image.png]]
-        embed_pattern = r'!\[\[([^\]]+)\]\]'
-        # Standard markdown images: ![alt](path/to/image.png)
-        md_img_pattern = r'!\[([^\]]*)\]\(([^)]+)\)'
-        # Obsidian attachments: [[file.pdf]]
-        attach_pattern = r'(?<!\!)\[\[([^\]|]+\.(?:pdf|docx?|xlsx?|pptx?|zip|mp4|mp3|wav)(?:\|[^\]]+)?)\]\]'
+        # Pick the output templates once rather than per reference
+        templates = _ASSET_TEMPLATES['org' if is_org else 'md']
+        embed_format = templates['embed'].format
+        image_format = templates['image'].format
+        attachment_format = templates['attachment'].format
+        copy_assets = self.assets_handling == 'copy'
+        # Markdown output in link mode leaves standard images as written
+        keep_md_images = not is_org and not copy_assets
+        
+        def asset_target(asset_path):
+            """Path the converted note should reference for an asset"""
+            return self.copy_asset(asset_path, output_dir) if copy_assets else asset_path
         
         def process_embed(match):
             """Process embedded files"""
             file_ref = match.group(1)
             
             # Check if it's an internal link (to another note) vs asset
-            if not any(file_ref.endswith(ext) for ext in 
-                      ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.pdf', 
-                       '.mp4', '.mp3', '.wav', '.mov', '.docx', '.xlsx', '.pptx']):
+            if not file_ref.lower().endswith(_ASSET_EXTS):
                 # It's likely a note reference, not an asset
                 return match.group(0)
             
             # Find the actual file
             asset_path = self.find_asset(file_ref, source_dir)
             if not asset_path:
-                print(f"Warning: Asset not found: {file_ref}")
+                logger.warning("Warning: Asset not found: %s", file_ref)
                 return match.group(0)
             
-            # Process based on handling mode
-            if self.assets_handling == 'copy':
-                new_path = self.copy_asset(asset_path, output_dir)
-                if is_org:
-                    return f"[[file:{new_path}]]"
-                else:
-                    return f"![{asset_path.stem}]({new_path})"
-            else:  # link mode
-                if is_org:
-                    return f"[[file:{asset_path}]]"
-                else:
-                    return f"![{asset_path.stem}]({asset_path})"
+            return embed_format(path=asset_target(asset_path), desc=asset_path.stem)
         
         def process_md_image(match):
             """Process markdown images"""
@@ -316,20 +511,12 @@ class ObsidianToDenoteConverter:
             
             asset_path = self.find_asset(img_path, source_dir)
             if not asset_path:
-                print(f"Warning: Image not found: {img_path}")
+                logger.warning("Warning: Image not found: %s", img_path)
                 return match.group(0)
             
-            if self.assets_handling == 'copy':
-                new_path = self.copy_asset(asset_path, output_dir)
-                if is_org:
-                    return f"[[file:{new_path}]]"
-                else:
-                    return f"![{alt_text}]({new_path})"
-            else:  # link mode
-                if is_org:
-                    return f"[[file:{asset_path}]]"
-                else:
-                    return match.group(0)
+            if keep_md_images:
+                return match.group(0)
+            return image_format(path=asset_target(asset_path), desc=alt_text)
         
         def process_attachment(match):
             """Process non-image attachments"""
@@ -342,36 +529,29 @@ class ObsidianToDenoteConverter:
             
             asset_path = self.find_asset(file_ref, source_dir)
             if not asset_path:
-                print(f"Warning: Attachment not found: {file_ref}")
+                logger.warning("Warning: Attachment not found: %s", file_ref)
                 return match.group(0)
             
-            if self.assets_handling == 'copy':
-                new_path = self.copy_asset(asset_path, output_dir)
-                if is_org:
-                    return f"[[file:{new_path}][{desc}]]"
-                else:
-                    return f"[{desc}]({new_path})"
-            else:  # link mode
-                if is_org:
-                    return f"[[file:{asset_path}][{desc}]]"
-                else:
-                    return f"[{desc}]({asset_path})"
+            return attachment_format(path=asset_target(asset_path), desc=desc)
         
         # Process content
-        content = re.sub(embed_pattern, process_embed, content)
-        content = re.sub(md_img_pattern, process_md_image, content)
-        content = re.sub(attach_pattern, process_attachment, content)
+        content = _EMBED.sub(process_embed, content)
+        content = _MD_IMG.sub(process_md_image, content)
+        content = _ATTACH.sub(process_attachment, content)
         
         return content
     
-    def convert_to_org(self, content, metadata, title, tags):
-        """Convert markdown content to org-mode format"""
-        lines = content.split('\n')
+    def convert_to_org(self, content, metadata, title, tags, created_time=None):
+        """Convert markdown content to org-mode format
+        
+        Args:
+            created_time: Note creation time for #+date (defaults to now)
+        """
         org_lines = []
         
         # Add org-mode header
         org_lines.append(f"#+title: {title}")
-        org_lines.append(f"#+date: {datetime.now().strftime('%Y-%m-%d')}")
+        org_lines.append(f"#+date: {(created_time or datetime.now()).strftime('%Y-%m-%d')}")
         
         if tags:
             org_lines.append(f"#+filetags: {' '.join(':' + tag + ':' for tag in tags)}")
@@ -386,54 +566,44 @@ class ObsidianToDenoteConverter:
         
         org_lines.append("")  # Empty line after header
         
-        in_code_block = False
-        code_lang = ""
-        
-        for line in lines:
-            # Handle code blocks
-            if line.startswith('```'):
-                if not in_code_block:
-                    code_lang = line[3:].strip()
-                    org_lines.append(f"#+BEGIN_SRC {code_lang}")
-                    in_code_block = True
-                else:
-                    org_lines.append("#+END_SRC")
-                    in_code_block = False
-                continue
-            
-            if in_code_block:
-                org_lines.append(line)
-                continue
-            
-            # Convert headers
-            if line.startswith('#'):
-                level = len(line) - len(line.lstrip('#'))
-                header_text = line[level:].strip()
-                org_lines.append('*' * level + ' ' + header_text)
+        def replace_markup(match):
+            """Convert a single markdown construct to its org-mode equivalent"""
+            if match.group('level') is not None:
+                return '*' * len(match.group('level')) + ' ' + match.group('heading').strip()
+            if match.group('ul') is not None:
+                checkbox = match.group('check')
+                if checkbox is None:
+                    return f"{match.group('ul')}- "
+                return f"{match.group('ul')}- [{'X' if checkbox == 'x' else ' '}] "
+            if match.group('ol') is not None:
+                return f"{match.group('ol')}{match.group('num')}. "
+            if match.group('bold') is not None:
+                return f"*{match.group('bold_text')}*"
+            if match.group('ital') is not None:
+                return f"/{match.group('ital_text')}/"
+            if match.group('strike') is not None:
+                return f"+{match.group('strike')}+"
+            return f"~{match.group('code')}~"
+        
+        # Odd-indexed segments are fenced code blocks, the rest is markdown.
+        # Everything is collected in one list so the output is joined once.
+        body = ['\n'.join(org_lines), '\n']
+        for i, segment in enumerate(_FENCED_CODE.split(content)):
+            if i % 2 == 0:
+                body.append(_MD_INLINE.sub(replace_markup, segment))
                 continue
             
-            # Convert emphasis
-            line = re.sub(r'\*\*(.+?)\*\*', r'*\1*', line)  # Bold
-            line = re.sub(r'__(.+?)__', r'*\1*', line)  # Bold alt
-            line = re.sub(r'\*(.+?)\*', r'/\1/', line)  # Italic
-            line = re.sub(r'_(.+?)_', r'/\1/', line)  # Italic alt
-            line = re.sub(r'~~(.+?)~~', r'+\1+', line)  # Strikethrough
-            line = re.sub(r'`([^`]+)`', r'~\1~', line)  # Inline code
-            
-            # Convert lists
-            line = re.sub(r'^(\s*)[-*+]\s', r'\1- ', line)  # Unordered lists
-            line = re.sub(r'^(\s*)(\d+)\.\s', r'\1\2. ', line)  # Ordered lists
-            
-            # Convert checkboxes
-            line = re.sub(r'^(\s*)- \[ \]\s', r'\1- [ ] ', line)
-            line = re.sub(r'^(\s*)- \[x\]\s', r'\1- [X] ', line)
-            
-            org_lines.append(line)
-        
-        content = '\n'.join(org_lines)
-        return self.convert_links(content, is_org=True)
+            code_lines = segment.split('\n')
+            code_lang = code_lines[0][3:].strip()
+            if len(code_lines) > 1 and code_lines[-1].startswith('```'):
+                code_lines[-1] = "#+END_SRC"
+            code_lines[0] = f"#+BEGIN_SRC {code_lang}"
+            body.append('\n'.join(code_lines))
+        
+        return self.convert_links(''.join(body), is_org=True)
     
-    def convert_file(self, input_path, output_dir, relative_path=None, preserve_structure=False, vault_root=None):
+    def convert_file(self, input_path, output_dir, relative_path=None, preserve_structure=False,
+                     vault_root=None, content=None, metadata=None, naming=None):
         """Convert a single Obsidian file to Denote format
         
         Args:
@@ -442,11 +612,21 @@ class ObsidianToDenoteConverter:
             relative_path: Relative path from input base directory
             preserve_structure: Whether to preserve directory structure
             vault_root: Root directory of the Obsidian vault
+            content: File content with frontmatter removed, if already read
+            metadata: Parsed frontmatter, used in place of the file's own
+            naming: generate_denote_filename's result for content, if already known
         """
-        with open(input_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        metadata, remaining_content = self.extract_yaml_frontmatter(content)
+        if content is None:
+            content = _read_text(input_path)
+            file_metadata, content = self.extract_yaml_frontmatter(content)
+            if metadata is None:
+                metadata = file_metadata
+        
+        # Generate Denote filename from the note as written, so it matches the
+        # name convert_directory planned for it
+        if naming is None:
+            naming = self.generate_denote_filename(input_path, metadata, content)
+        denote_filename, title, tags, created_time = naming
         
         # Get source directory for asset resolution
         source_dir = input_path.parent
@@ -455,24 +635,20 @@ class ObsidianToDenoteConverter:
         
         # Process assets before other conversions
         remaining_content = self.process_assets(
-            remaining_content, 
+            content, 
             source_dir, 
             output_dir,
             is_org=(self.output_format == 'org')
         )
         
-        # Generate Denote filename
-        denote_filename, title, tags, created_time = self.generate_denote_filename(
-            input_path, metadata, remaining_content
-        )
-        
         # Store mapping for link conversion
         self.file_mapping[input_path] = denote_filename
+        self._map_stem(input_path, denote_filename)
         
         # Convert content
         if self.output_format == 'org':
             converted_content = self.convert_to_org(
-                remaining_content, metadata, title, tags
+                remaining_content, metadata, title, tags, created_time
             )
         else:
             # Keep as markdown but update links
@@ -486,9 +662,9 @@ class ObsidianToDenoteConverter:
                 f"tags: {', '.join(tags)}",
                 f"identifier: {created_time.strftime('%Y%m%dT%H%M%S')}",
                 f"---",
-                "",
+                converted_content,
             ]
-            converted_content = '\n'.join(header_lines) + converted_content
+            converted_content = '\n'.join(header_lines)
         
         # Determine output path
         if preserve_structure and relative_path:
@@ -500,12 +676,13 @@ class ObsidianToDenoteConverter:
             # Flat structure (Denote default)
             output_path = Path(output_dir) / denote_filename
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(converted_content)
+        # Leave identical output untouched so re-runs don't bump mtimes
+        _write_if_changed(output_path, converted_content.encode('utf-8'))
         
         return denote_filename, output_path
     
-    def convert_directory(self, input_dir, output_dir, preserve_structure=False, add_folder_tags=False):
+    def convert_directory(self, input_dir, output_dir, preserve_structure=False,
+                          add_folder_tags=False, workers=1):
         """Convert all Obsidian files in a directory
         
         Args:
@@ -513,58 +690,210 @@ class ObsidianToDenoteConverter:
             output_dir: Output directory for Denote files
             preserve_structure: Whether to preserve directory structure
             add_folder_tags: Whether to add folder names as tags
+            workers: Number of worker processes (None or 0 for one per CPU)
         """
         input_path = Path(input_dir)
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
         # First pass: collect all files for mapping
-        md_files = list(input_path.glob('**/*.md'))
+        md_files = list(_iter_markdown_files(input_path))
         
         print(f"Found {len(md_files)} markdown files to convert")
         if self.assets_handling == 'copy':
             print(f"Assets will be copied to {self.assets_dir}/ directory")
         
+        if not workers:
+            workers = os.cpu_count() or 1
+        
+        if len(md_files) < 2:
+            workers = 1
+        
+        args = (input_path, output_dir, preserve_structure, add_folder_tags)
+        if workers > 1:
+            results = self._convert_files_parallel(md_files, args, workers)
+        else:
+            results = self._convert_files_serial(md_files, args)
+        
         converted_files = []
+        for md_file, result, error in results:
+            if error:
+                message, tb = error
+                print(f"Error converting {md_file}: {message}")
+                print(tb, file=sys.stderr, end='')
+                continue
+            
+            relative_path, new_filename, output_file_path = result
+            converted_files.append((md_file, output_file_path))
+            
+            # Display progress with structure info
+            if not self.verbose:
+                if len(converted_files) % _PROGRESS_INTERVAL == 0:
+                    print(f"Converted {len(converted_files)}/{len(md_files)} files...")
+            elif preserve_structure:
+                print(f"Converted: {relative_path} -> {output_file_path.relative_to(output_path)}")
+            else:
+                print(f"Converted: {md_file.name} -> {new_filename}")
+        
+        return converted_files
+    
+    def _convert_files_serial(self, md_files, args):
+        """Convert files one at a time, yielding (md_file, result, error)
+        
+        Every file is read and named before any is converted, so links between
+        notes resolve regardless of conversion order. Each file is read once.
+        """
+        input_path, output_dir, preserve_structure, add_folder_tags = args
+        
+        plans = []
         for md_file in md_files:
             try:
-                relative_path = md_file.relative_to(input_path)
-                
-                # Optionally add folder as tag
-                if add_folder_tags and relative_path.parent != Path('.'):
-                    # Read file to add folder tags
-                    with open(md_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    metadata, remaining = self.extract_yaml_frontmatter(content)
-                    if metadata is None:
-                        metadata = {}
-                    
-                    # Add folder names as tags
-                    folder_tags = [self.slugify(part) for part in relative_path.parent.parts]
-                    if 'tags' not in metadata:
-                        metadata['tags'] = []
-                    elif isinstance(metadata['tags'], str):
-                        metadata['tags'] = [metadata['tags']]
-                    metadata['tags'].extend(folder_tags)
-                
-                new_filename, output_file_path = self.convert_file(
-                    md_file, output_dir, relative_path, preserve_structure, vault_root=input_path
-                )
-                converted_files.append((md_file, output_file_path))
-                
-                # Display progress with structure info
-                if preserve_structure:
-                    print(f"Converted: {relative_path} -> {output_file_path.relative_to(output_path)}")
-                else:
-                    print(f"Converted: {md_file.name} -> {new_filename}")
-                    
+                plan = self._plan_directory_file(md_file, input_path, add_folder_tags)
             except Exception as e:
-                print(f"Error converting {md_file}: {e}")
-                import traceback
-                traceback.print_exc()
+                yield md_file, None, (str(e), traceback.format_exc())
+                continue
+            self._map_stem(md_file, plan[3][0])
+            plans.append((md_file, plan))
         
-        return converted_files
+        for md_file, plan in plans:
+            try:
+                yield md_file, self._convert_planned_file(
+                    md_file, plan, input_path, output_dir, preserve_structure
+                ), None
+            except Exception as e:
+                yield md_file, None, (str(e), traceback.format_exc())
+    
+    def _convert_files_parallel(self, md_files, args, workers):
+        """Convert files in a process pool, yielding (md_file, result, error)
+        
+        A first pool reads and names every file so that the second, which is
+        started with the complete filename map, resolves links between notes
+        whichever worker converts them. Plans are handed to the second pool so
+        no file is read twice.
+        """
+        # Imported here so serial runs skip loading multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        input_path, output_dir, preserve_structure, add_folder_tags = args
+        chunksize = max(1, len(md_files) // (workers * 4))
+        init_args = (self, logger.getEffectiveLevel())
+        
+        plan_tasks = [(md_file, input_path, add_folder_tags) for md_file in md_files]
+        tasks = []
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as executor:
+            for md_file, plan, error in executor.map(
+                _plan_in_worker, plan_tasks, chunksize=chunksize
+            ):
+                if error:
+                    yield md_file, None, error
+                    continue
+                self._map_stem(md_file, plan[3][0])
+                tasks.append((md_file, plan, input_path, output_dir, preserve_structure))
+        
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as executor:
+            for md_file, result, error, pending_copies in executor.map(
+                _convert_in_worker, tasks, chunksize=chunksize
+            ):
+                # Workers only dedupe their own copies; identical content named
+                # differently by another worker is pointed at the first copy
+                renamed = {}
+                for asset_path, dest_path, digest in pending_copies:
+                    key = (dest_path.parent, digest)
+                    first_copy = self._content_hash_to_dest.get(key)
+                    if first_copy is None:
+                        self._copy_asset_file(asset_path, dest_path, digest)
+                        self._content_hash_to_dest[key] = first_copy = dest_path
+                    elif first_copy != dest_path:
+                        renamed[str(dest_path.relative_to(output_dir))] = str(
+                            first_copy.relative_to(output_dir)
+                        )
+                    self.asset_mapping.setdefault(
+                        str(asset_path), str(first_copy.relative_to(output_dir))
+                    )
+                if result:
+                    if renamed:
+                        _repoint_assets(result[2], renamed)
+                    self.file_mapping[md_file] = result[1]
+                yield md_file, result, error
+    
+    def _read_directory_file(self, md_file, input_path, add_folder_tags):
+        """Read a file found by convert_directory, adding folder tags if requested
+        
+        Returns:
+            Tuple of (relative_path, metadata, remaining_content)
+        """
+        relative_path = md_file.relative_to(input_path)
+        
+        content = _read_text(md_file)
+        metadata, remaining_content = self.extract_yaml_frontmatter(content)
+        
+        # Optionally add folder as tag
+        if add_folder_tags and relative_path.parent != Path('.'):
+            if not metadata:
+                metadata = {}
+            
+            # Add folder names as tags
+            folder_tags = [self.slugify(part) for part in relative_path.parent.parts]
+            tags = metadata.get('tags') or []
+            if isinstance(tags, str):
+                tags = [tags]
+            metadata['tags'] = list(tags) + folder_tags
+        
+        return relative_path, metadata, remaining_content
+    
+    def _plan_directory_file(self, md_file, input_path, add_folder_tags):
+        """Read and name a file found by convert_directory, without converting it
+        
+        Returns:
+            Tuple of (relative_path, metadata, remaining_content, naming), where
+            naming is generate_denote_filename's result
+        """
+        relative_path, metadata, remaining_content = self._read_directory_file(
+            md_file, input_path, add_folder_tags
+        )
+        naming = self.generate_denote_filename(md_file, metadata, remaining_content)
+        return relative_path, metadata, remaining_content, naming
+    
+    def _convert_planned_file(self, md_file, plan, input_path, output_dir, preserve_structure):
+        """Convert a file planned by _plan_directory_file
+        
+        Returns:
+            Tuple of (relative_path, new_filename, output_file_path)
+        """
+        relative_path, metadata, remaining_content, naming = plan
+        new_filename, output_file_path = self.convert_file(
+            md_file, output_dir, relative_path, preserve_structure, vault_root=input_path,
+            content=remaining_content, metadata=metadata, naming=naming
+        )
+        return relative_path, new_filename, output_file_path
+
+# Per-process converter used by convert_directory's worker pool
+_worker_converter = None
+
+def _init_worker(converter, log_level):
+    """Install the parent's converter (and its file mappings) in a worker"""
+    global _worker_converter
+    # Workers started with spawn or forkserver don't inherit the parent's logging setup
+    if not logger.hasHandlers():
+        _configure_logging(log_level)
+    converter._pending_copies = []
+    _worker_converter = converter
+
+def _plan_in_worker(task):
+    try:
+        plan, error = _worker_converter._plan_directory_file(*task), None
+    except Exception as e:
+        plan, error = None, (str(e), traceback.format_exc())
+    return task[0], plan, error
+
+def _convert_in_worker(task):
+    converter = _worker_converter
+    converter._pending_copies = []
+    try:
+        result, error = converter._convert_planned_file(*task), None
+    except Exception as e:
+        result, error = None, (str(e), traceback.format_exc())
+    return task[0], result, error, converter._pending_copies
 
 def main():
     parser = argparse.ArgumentParser(
@@ -610,13 +939,27 @@ def main():
         default='assets',
         help='Directory name for copied assets (default: assets)'
     )
+    parser.add_argument(
+        '-v', '--verbose',
+        action='store_true',
+        help='Report every converted file and asset'
+    )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of worker processes for directory conversion, 0 for one per CPU (default: 1)'
+    )
     
     args = parser.parse_args()
     
+    _configure_logging(logging.DEBUG if args.verbose else logging.WARNING)
+    
     converter = ObsidianToDenoteConverter(
         output_format=args.format,
         preserve_links=args.preserve_links,
-        assets_handling=args.assets
+        assets_handling=args.assets,
+        verbose=args.verbose
     )
     
     # Set custom assets directory if specified
@@ -635,7 +978,8 @@ def main():
             input_path, 
             args.output,
             preserve_structure=args.preserve_structure,
-            add_folder_tags=args.add_folder_tags
+            add_folder_tags=args.add_folder_tags,
+            workers=args.jobs
         )
         print(f"\nConverted {len(converted)} files")
         
@@ -1,11 +1,32 @@
 import pytest
 
+from obsidian_to_denote.converter import ObsidianToDenoteConverter
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-slow", action="store_true", default=False,
+        help="run end-to-end tests marked slow"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked slow unless --run-slow is given"""
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="need --run-slow option to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
-@pytest.fixture
-def temp_vault(tmp_path):
-    """Create a temporary Obsidian vault with sample content"""
-    vault = tmp_path / "test_vault"
-    vault.mkdir()
+
+@pytest.fixture(scope="session")
+def temp_vault(tmp_path_factory):
+    """Create a temporary Obsidian vault with sample content
+
+    Built once per session; tests must treat it as read-only.
+    """
+    vault = tmp_path_factory.mktemp("test_vault")
 
     # Create .obsidian folder to identify as vault
     (vault / ".obsidian").mkdir()
@@ -120,6 +141,21 @@ This note has spëcial chàracters in the filename and content.
     return vault
 
 
+@pytest.fixture(scope="session")
+def converted_vault(request, temp_vault, tmp_path_factory):
+    """Convert temp_vault once per set of options and share the result
+
+    Parametrize indirectly with a dict of options (output_format,
+    preserve_structure, add_folder_tags); tests using the same options
+    share a single conversion. Returns (output_dir, converted).
+    """
+    options = dict(getattr(request, "param", None) or {})
+    converter = ObsidianToDenoteConverter(output_format=options.pop("output_format", "org"))
+    output = tmp_path_factory.mktemp("converted_vault")
+    converted = converter.convert_directory(temp_vault, output, **options)
+    return output, converted
+
+
 @pytest.fixture
 def output_dir(tmp_path):
     """Create a temporary output directory"""
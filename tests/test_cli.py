@@ -1,47 +1,73 @@
-import subprocess
+import logging
 import sys
 
+import pytest
+
+from obsidian_to_denote import converter
+
+
+def run_cli(capsys, monkeypatch, *args):
+    """Run the converter CLI in-process and return (exit code, stdout, stderr)"""
+    monkeypatch.setattr(sys, "argv", ["obsidian-to-denote", *map(str, args)])
+    try:
+        returncode = converter.main()
+    except SystemExit as e:
+        returncode = e.code
+    out, err = capsys.readouterr()
+    return returncode, out, err
+
+
+@pytest.fixture(autouse=True)
+def reset_package_logging():
+    """Undo main()'s logging setup so it doesn't leak into later tests"""
+    yield
+    package_logger = logging.getLogger("obsidian_to_denote")
+    if converter._log_handler is not None:
+        package_logger.removeHandler(converter._log_handler)
+        converter._log_handler = None
+    package_logger.setLevel(logging.NOTSET)
+
 
 class TestCLI:
     """Test command-line interface"""
 
-    def test_help_message(self):
+    def test_help_message(self, capsys, monkeypatch):
         """Test that help message works"""
-        result = subprocess.run(
-            [sys.executable, "-m", "obsidian_to_denote.converter", "--help"],
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0
-        assert "Convert Obsidian markdown files to Denote format" in result.stdout
-        assert "--format" in result.stdout
-        assert "--preserve-links" in result.stdout
+        returncode, out, _ = run_cli(capsys, monkeypatch, "--help")
+        assert returncode == 0
+        assert "Convert Obsidian markdown files to Denote format" in out
+        assert "--format" in out
+        assert "--preserve-links" in out
 
-    def test_missing_arguments(self):
+    def test_missing_arguments(self, capsys, monkeypatch):
         """Test error handling for missing arguments"""
-        result = subprocess.run(
-            [sys.executable, "-m", "obsidian_to_denote.converter"],
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode != 0
-        assert "error" in result.stderr.lower() or "usage" in result.stderr.lower()
+        returncode, _, err = run_cli(capsys, monkeypatch)
+        assert returncode == 2
+        assert "error" in err.lower() or "usage" in err.lower()
 
-    def test_invalid_input_path(self, tmp_path):
+    def test_invalid_input_path(self, capsys, monkeypatch, tmp_path):
         """Test error handling for invalid input path"""
-        result = subprocess.run(
-            [
-                sys.executable, "-m", "obsidian_to_denote.converter",
-                str(tmp_path / "nonexistent"),
-                str(tmp_path / "output")
-            ],
-            capture_output=True,
-            text=True
+        returncode, out, _ = run_cli(
+            capsys, monkeypatch,
+            tmp_path / "nonexistent",
+            tmp_path / "output"
         )
-        assert result.returncode != 0
-        assert "not a valid file or directory" in result.stdout
+        assert returncode == 1
+        assert "not a valid file or directory" in out
+
+    def test_verbose_only_affects_package_logging(self, capsys, monkeypatch, tmp_path):
+        """Test that -v enables debug output for the converter alone"""
+        input_file = tmp_path / "test.md"
+        input_file.write_text("# Test Note")
+        root_level = logging.getLogger().level
+
+        returncode, _, _ = run_cli(capsys, monkeypatch, input_file, tmp_path / "output", "-v")
 
-    def test_single_file_conversion(self, tmp_path):
+        assert returncode == 0
+        assert logging.getLogger("obsidian_to_denote").level == logging.DEBUG
+        assert logging.getLogger().level == root_level
+
+    def test_single_file_conversion(self, capsys, monkeypatch, tmp_path):
         """Test converting a single file via CLI"""
         # Create test file
         input_file = tmp_path / "test.md"
@@ -49,52 +75,43 @@ class TestCLI:
 
         output_dir = tmp_path / "output"
 
-        result = subprocess.run(
-            [
-                sys.executable, "-m", "obsidian_to_denote.converter",
-                str(input_file),
-                str(output_dir),
-                "--format", "org"
-            ],
-            capture_output=True,
-            text=True
+        returncode, out, _ = run_cli(
+            capsys, monkeypatch,
+            input_file,
+            output_dir,
+            "--format", "org"
         )
 
-        assert result.returncode == 0
-        assert "Converted:" in result.stdout
+        assert returncode == 0
+        assert "Converted:" in out
         assert output_dir.exists()
 
         # Check that an org file was created
-        org_files = list(output_dir.glob("*.org"))
-        assert len(org_files) == 1
+        assert sum(1 for _ in output_dir.glob("*.org")) == 1
 
-    def test_directory_conversion_with_options(self, temp_vault, tmp_path):
+    @pytest.mark.slow
+    def test_directory_conversion_with_options(self, capsys, monkeypatch, temp_vault, tmp_path):
         """Test converting a directory with various options"""
         output_dir = tmp_path / "output"
 
-        result = subprocess.run(
-            [
-                sys.executable, "-m", "obsidian_to_denote.converter",
-                str(temp_vault),
-                str(output_dir),
-                "--format", "md",
-                "--preserve-links",
-                "--add-folder-tags",
-                "--assets", "copy",
-                "--assets-dir", "media"
-            ],
-            capture_output=True,
-            text=True
+        returncode, out, _ = run_cli(
+            capsys, monkeypatch,
+            temp_vault,
+            output_dir,
+            "--format", "md",
+            "--preserve-links",
+            "--add-folder-tags",
+            "--assets", "copy",
+            "--assets-dir", "media"
         )
 
-        assert result.returncode == 0
-        assert "Converted" in result.stdout
-        assert "files" in result.stdout
+        assert returncode == 0
+        assert "Converted" in out
+        assert "files" in out
 
         # Check output
         assert output_dir.exists()
-        md_files = list(output_dir.glob("*.md"))
-        assert len(md_files) > 0
+        assert next(output_dir.glob("*.md"), None) is not None
 
         # Check if assets directory was created with custom name
         if any("![[" in f.read_text() for f in temp_vault.rglob("*.md")):
@@ -102,62 +119,37 @@ class TestCLI:
             # Assets directory might not exist if no assets were found
             # This is okay - just checking the option worked
 
-    def test_preserve_structure_option(self, temp_vault, tmp_path):
+    def test_preserve_structure_option(self, capsys, monkeypatch, temp_vault, tmp_path):
         """Test the preserve-structure option"""
         output_dir = tmp_path / "output"
 
-        result = subprocess.run(
-            [
-                sys.executable, "-m", "obsidian_to_denote.converter",
-                str(temp_vault),
-                str(output_dir),
-                "--preserve-structure"
-            ],
-            capture_output=True,
-            text=True
+        returncode, _, _ = run_cli(
+            capsys, monkeypatch,
+            temp_vault,
+            output_dir,
+            "--preserve-structure"
         )
 
-        assert result.returncode == 0
+        assert returncode == 0
 
         # Check that subdirectories were created
         assert (output_dir / "projects").exists() or \
                (output_dir / "daily").exists() or \
                (output_dir / "archive").exists()
 
-    def test_format_options(self, tmp_path):
+    @pytest.mark.parametrize("fmt", ["org", "md"])
+    def test_format_options(self, capsys, monkeypatch, tmp_path, fmt):
         """Test both org and md format options"""
         # Create simple test file
         input_file = tmp_path / "test.md"
         input_file.write_text("# Test\n**Bold** and *italic*")
 
-        # Test org format
-        output_org = tmp_path / "output_org"
-        result = subprocess.run(
-            [
-                sys.executable, "-m", "obsidian_to_denote.converter",
-                str(input_file),
-                str(output_org),
-                "--format", "org"
-            ],
-            capture_output=True,
-            text=True
-        )
-        assert result.returncode == 0
-        org_files = list(output_org.glob("*.org"))
-        assert len(org_files) == 1
-
-        # Test md format
-        output_md = tmp_path / "output_md"
-        result = subprocess.run(
-            [
-                sys.executable, "-m", "obsidian_to_denote.converter",
-                str(input_file),
-                str(output_md),
-                "--format", "md"
-            ],
-            capture_output=True,
-            text=True
+        output_dir = tmp_path / "output"
+        returncode, _, _ = run_cli(
+            capsys, monkeypatch,
+            input_file,
+            output_dir,
+            "--format", fmt
         )
-        assert result.returncode == 0
-        md_files = list(output_md.glob("*.md"))
-        assert len(md_files) == 1
+        assert returncode == 0
+        assert sum(1 for _ in output_dir.glob(f"*.{fmt}")) == 1
@@ -3,35 +3,65 @@ Tests for Obsidian to Denote Converter
 """
 
 import os
-import tempfile
-import shutil
+import re
 from pathlib import Path
-from datetime import datetime
+
 import pytest
-import yaml
 
 from obsidian_to_denote.converter import ObsidianToDenoteConverter
 
+# Denote filename: timestamp--slug[__tags].ext
+FILENAME_RE = re.compile(r"(\d{8}T\d{6})--([a-z0-9-]+)(?:__([a-z0-9_-]+))?\.(org|md)")
+
+# Seed notes and attachments for the integration sample vault
+_SAMPLE_VAULT_FILES = {
+    "index.md": b"""---
+title: Index
+tags: [main, toc]
+---
+# Index
+
+This is the main index linking to [[projects/project1]] and [[daily/2024-01-15]].""",
+    "projects/project1.md": b"""---
+title: Project Alpha
+tags: [project, important]
+---
+# Project Alpha
+
+See the [[index]] for more info.
+Check the diagram: ![[diagram.png]]""",
+    "daily/2024-01-15.md": b"""# Daily Note
+
+- [ ] Task 1
+- [x] Task 2
+
+Worked on [[projects/project1]]""",
+    # A fake attachment
+    "attachments/diagram.png": b"fake png data",
+}
+
+# converted_vault option sets; tests using the same set share one conversion
+FOLDER_TAGS = {"add_folder_tags": True}
+MD_STRUCTURE = {"output_format": "md", "preserve_structure": True}
+
 
 class TestObsidianToDenoteConverter:
     """Test suite for the converter"""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def converter_org(self):
-        """Create a converter instance for org-mode output"""
+        """Create a shared converter instance for org-mode output"""
         return ObsidianToDenoteConverter(output_format='org')
 
     @pytest.fixture
-    def converter_md(self):
-        """Create a converter instance for markdown output"""
-        return ObsidianToDenoteConverter(output_format='md')
+    def mutable_converter_org(self):
+        """Create a fresh org-mode converter for tests that change its state"""
+        return ObsidianToDenoteConverter(output_format='org')
 
     @pytest.fixture
-    def temp_dir(self):
-        """Create a temporary directory for test files"""
-        temp_dir = tempfile.mkdtemp()
-        yield temp_dir
-        shutil.rmtree(temp_dir)
+    def mutable_converter_md(self):
+        """Create a fresh markdown converter for tests that change its state"""
+        return ObsidianToDenoteConverter(output_format='md')
 
     def test_slugify(self, converter_org):
         """Test the slugify function"""
@@ -82,10 +112,10 @@ This is the content."""
         assert metadata is None or metadata == {}
         assert "# Content" in remaining
 
-    def test_generate_denote_filename(self, converter_org, temp_dir):
+    def test_generate_denote_filename(self, converter_org, tmp_path):
         """Test Denote filename generation"""
         # Create a test file
-        test_file = Path(temp_dir) / "test.md"
+        test_file = tmp_path / "test.md"
         test_file.write_text("# Test Content")
         
         metadata = {
@@ -98,20 +128,18 @@ This is the content."""
             test_file, metadata, content
         )
         
-        # Check filename format
-        assert filename.endswith('.org')
-        assert '--test-note__' in filename
-        assert 'tag1' in filename
-        assert 'tag2' in filename
-        
-        # Check timestamp format (YYYYMMDDTHHMMSS)
-        timestamp_part = filename.split('--')[0]
-        assert len(timestamp_part) == 15  # YYYYMMDDTHHMMSS
-        assert timestamp_part[8] == 'T'
+        # Check filename format, including the YYYYMMDDTHHMMSS timestamp
+        match = FILENAME_RE.fullmatch(filename)
+        assert match, filename
+        assert match.group(2) == 'test-note'
+        # Tags keep their frontmatter order so re-runs give the same name
+        assert match.group(3) == 'tag1_tag2'
+        assert match.group(4) == 'org'
+        assert tags == ['tag1', 'tag2']
 
-    def test_generate_denote_filename_no_metadata(self, converter_org, temp_dir):
+    def test_generate_denote_filename_no_metadata(self, converter_org, tmp_path):
         """Test filename generation without metadata"""
-        test_file = Path(temp_dir) / "my-note.md"
+        test_file = tmp_path / "my-note.md"
         test_file.write_text("Just some content")
         
         filename, title, tags, created_time = converter_org.generate_denote_filename(
@@ -119,14 +147,16 @@ This is the content."""
         )
         
         # Should use filename, not content
-        assert '--my-note' in filename
-        assert filename.endswith('.org')
+        match = FILENAME_RE.fullmatch(filename)
+        assert match, filename
+        assert match.group(2) == 'my-note'
+        assert match.group(4) == 'org'
         assert title == "my-note"
 
-    def test_generate_denote_filename_with_heading(self, converter_org, temp_dir):
+    def test_generate_denote_filename_with_heading(self, converter_org, tmp_path):
         """Test filename generation - only uses heading for generic filenames"""
         # Test with meaningful filename - should NOT use heading
-        test_file = Path(temp_dir) / "important-document.md"
+        test_file = tmp_path / "important-document.md"
         content = "# My Important Note\nSome content"
         test_file.write_text(content)
         
@@ -139,7 +169,7 @@ This is the content."""
         assert title == "important-document"
         
         # Test with generic filename - SHOULD use heading
-        test_file2 = Path(temp_dir) / "untitled.md"
+        test_file2 = tmp_path / "untitled.md"
         test_file2.write_text(content)
         
         filename2, title2, tags2, created_time2 = converter_org.generate_denote_filename(
@@ -150,12 +180,12 @@ This is the content."""
         assert '--my-important-note' in filename2
         assert title2 == "My Important Note"
     
-    def test_filename_priority(self, converter_org, temp_dir):
+    def test_filename_priority(self, converter_org, tmp_path):
         """Test the priority of title sources"""
         content = "# First Heading\nSome content"
         
         # Case 1: Meaningful filename, no metadata - use filename
-        test_file1 = Path(temp_dir) / "decommission-deft-servers.md"
+        test_file1 = tmp_path / "decommission-deft-servers.md"
         test_file1.write_text(content)
         
         filename1, title1, _, _ = converter_org.generate_denote_filename(
@@ -173,7 +203,7 @@ This is the content."""
         assert '--metadata-title' in filename2
         
         # Case 3: Generic filename, no metadata - use heading
-        test_file3 = Path(temp_dir) / "new-note.md"
+        test_file3 = tmp_path / "new-note.md"
         test_file3.write_text(content)
         
         filename3, title3, _, _ = converter_org.generate_denote_filename(
@@ -190,11 +220,38 @@ This is the content."""
         assert "[[file:my-note.org][my-note]]" in result
         assert "[[file:another note.org][description]]" in result
 
-    def test_convert_links_to_markdown(self, converter_md):
+    def test_convert_links_uses_file_mapping(self, mutable_converter_org, tmp_path):
+        """Test that links to converted notes point at their Denote filenames"""
+        input_file = tmp_path / "my-note.md"
+        input_file.write_text("# My Note")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        filename, _ = mutable_converter_org.convert_file(input_file, output_dir)
+        result = mutable_converter_org.convert_links("See [[my-note]]", is_org=True)
+
+        assert f"[[file:{Path(filename).stem}.org][my-note]]" in result
+
+    def test_convert_links_follow_reconverted_file(self, mutable_converter_org, tmp_path):
+        """Test that links follow a note whose title changed on re-conversion"""
+        input_file = tmp_path / "note.md"
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        input_file.write_text("---\ntitle: First\n---\nBody")
+        mutable_converter_org.convert_file(input_file, output_dir)
+        input_file.write_text("---\ntitle: Second\n---\nBody")
+        filename, _ = mutable_converter_org.convert_file(input_file, output_dir)
+
+        assert '--second' in filename
+        result = mutable_converter_org.convert_links("See [[note]]", is_org=True)
+        assert f"[[file:{Path(filename).stem}.org][note]]" in result
+
+    def test_convert_links_to_markdown(self, mutable_converter_md):
         """Test converting Obsidian links to standard markdown"""
-        converter_md.preserve_links = False
+        mutable_converter_md.preserve_links = False
         content = "Check [[my-note]] and [[another note|description]]"
-        result = converter_md.convert_links(content, is_org=False)
+        result = mutable_converter_md.convert_links(content, is_org=False)
         
         assert "[my-note](my-note.md)" in result
         assert "[description](another note.md)" in result
@@ -217,8 +274,9 @@ This is the content."""
         content = "**bold** and *italic* and ~~strikethrough~~ and `code`"
         result = converter_org.convert_to_org(content, {}, "Test", [])
         
-        # Note: The conversion might be complex due to nested replacements
         # Check for org-mode syntax
+        assert "*bold*" in result  # Bold
+        assert "/italic/" in result  # Italic
         assert "~code~" in result  # Inline code
         assert "+strikethrough+" in result  # Strikethrough
 
@@ -244,6 +302,15 @@ This is the content."""
         assert "- [ ] Unchecked" in result
         assert "- [X] Checked" in result  # Note capital X in org-mode
 
+    def test_convert_to_org_unmatched_backtick(self, converter_org):
+        """Test that a stray backtick doesn't swallow the following lines"""
+        content = "Press the ` key\n\n## Setup\n\n- [ ] Install the `tool`\n"
+        
+        result = converter_org.convert_to_org(content, {}, "Test", [])
+        assert "Press the ` key" in result
+        assert "** Setup" in result
+        assert "- [ ] Install the ~tool~" in result
+
     def test_convert_to_org_code_blocks(self, converter_org):
         """Test markdown to org-mode code block conversion"""
         content = """```python
@@ -273,10 +340,10 @@ def hello():
         assert ":AUTHOR: John Doe" in result
         assert ":CREATED: 2024-01-15" in result
 
-    def test_convert_file_basic(self, converter_org, temp_dir):
+    def test_convert_file_basic(self, mutable_converter_org, tmp_path):
         """Test basic file conversion"""
         # Create input file
-        input_file = Path(temp_dir) / "input" / "test.md"
+        input_file = tmp_path / "input" / "test.md"
         input_file.parent.mkdir(parents=True, exist_ok=True)
         input_file.write_text("""---
 title: Test Note
@@ -285,11 +352,11 @@ tags: [test]
 # Test Note
 This is a test.""")
         
-        output_dir = Path(temp_dir) / "output"
+        output_dir = tmp_path / "output"
         output_dir.mkdir(parents=True, exist_ok=True)
         
         # Convert file
-        filename, output_path = converter_org.convert_file(
+        filename, output_path = mutable_converter_org.convert_file(
             input_file, output_dir
         )
         
@@ -303,60 +370,120 @@ This is a test.""")
         assert "#+title: Test Note" in content
         assert "* Test Note" in content
 
-    def test_convert_directory(self, converter_org, temp_dir):
+    def test_convert_file_crlf(self, mutable_converter_org, tmp_path):
+        """Test that files with Windows line endings are converted"""
+        input_file = tmp_path / "windows.md"
+        input_file.write_bytes(
+            b"---\r\ntitle: Test Note\r\ntags: [test]\r\n---\r\n# Heading\r\nBody"
+        )
+
+        filename, output_path = mutable_converter_org.convert_file(input_file, tmp_path)
+
+        assert '--test-note__test' in filename
+        content = output_path.read_bytes().decode('utf-8')
+        assert "* Heading\nBody" in content
+        assert '\r' not in content
+
+    def test_convert_file_skips_unchanged_output(self, mutable_converter_org, tmp_path):
+        """Test that re-converting an unchanged file leaves the output untouched"""
+        input_file = tmp_path / "note.md"
+        # The note's own date, not today's, keeps the output stable across days
+        input_file.write_text("---\ntitle: Stable\ncreated: 2024-01-15\n---\nBody")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        _, output_path = mutable_converter_org.convert_file(input_file, output_dir)
+        os.utime(output_path, (0, 0))
+        _, second_path = mutable_converter_org.convert_file(input_file, output_dir)
+
+        assert second_path == output_path
+        assert output_path.stat().st_mtime == 0
+        assert "#+date: 2024-01-15" in output_path.read_text()
+        assert [p.name for p in output_dir.iterdir()] == [output_path.name]
+        # Same permissions as a file written directly
+        reference = tmp_path / "reference.txt"
+        reference.write_text("")
+        assert output_path.stat().st_mode & 0o777 == reference.stat().st_mode & 0o777
+
+    def test_convert_file_failed_write_leaves_no_temp_file(self, mutable_converter_org, tmp_path,
+                                                           monkeypatch):
+        """Test that a failed output write cleans up its temporary file"""
+        input_file = tmp_path / "note.md"
+        input_file.write_text("Body")
+        output_dir = tmp_path / "output"
+        output_dir.mkdir()
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(os, "replace", failing_replace)
+        with pytest.raises(OSError):
+            mutable_converter_org.convert_file(input_file, output_dir)
+
+        assert list(output_dir.iterdir()) == []
+
+    def test_convert_directory(self, converted_vault):
         """Test directory conversion"""
-        # Create input directory structure
-        input_dir = Path(temp_dir) / "vault"
-        (input_dir / "folder1").mkdir(parents=True, exist_ok=True)
-        (input_dir / "folder2").mkdir(parents=True, exist_ok=True)
+        output_dir, converted = converted_vault
         
-        # Create test files
-        (input_dir / "note1.md").write_text("# Note 1")
-        (input_dir / "folder1" / "note2.md").write_text("# Note 2")
-        (input_dir / "folder2" / "note3.md").write_text("# Note 3")
+        assert len(converted) == 6
         
-        output_dir = Path(temp_dir) / "output"
-        
-        # Convert directory
-        converted = converter_org.convert_directory(input_dir, output_dir)
+        # Check all files were converted
+        assert sum(1 for _ in output_dir.glob("*.org")) == 6
+
+    def test_convert_directory_copies_assets(self, converted_vault):
+        """Test that embedded assets are copied alongside the notes"""
+        output_dir, _ = converted_vault
         
-        assert len(converted) == 3
+        suffixes = sorted(p.suffix for p in (output_dir / "assets").iterdir())
+        assert suffixes == [".pdf", ".png"]
+
+    def test_convert_directory_resolves_links(self, converted_vault):
+        """Test that wiki-links point at the linked note's Denote filename"""
+        output_dir, _ = converted_vault
         
-        # Check all files were converted
-        output_files = list(output_dir.glob("*.org"))
-        assert len(output_files) == 3
+        target = next(output_dir.glob("*--meeting-notes-2024-01-15.org"))
+        project = next(output_dir.glob("*--project-alpha__*.org"))
+        assert f"[[file:{target.stem}.org][meeting-notes-2024-01-15]]" in project.read_text()
 
-    def test_convert_directory_with_folder_tags(self, converter_org, temp_dir):
+    @pytest.mark.parametrize("converted_vault", [FOLDER_TAGS], indirect=True)
+    def test_convert_directory_with_folder_tags(self, converted_vault):
         """Test directory conversion with folder tags"""
-        # Create input structure
-        input_dir = Path(temp_dir) / "vault"
-        (input_dir / "projects").mkdir(parents=True, exist_ok=True)
+        output_dir, _ = converted_vault
         
-        # Create test file
-        (input_dir / "projects" / "my-project.md").write_text("""---
-tags: [important]
----
-# My Project""")
-        
-        output_dir = Path(temp_dir) / "output"
+        # Check that folder name is added to the frontmatter tags
+        filename = next(output_dir.glob("*--project-alpha__*.org")).name
+        assert filename.endswith('__project_active_projects.org')
+
+    @pytest.mark.parametrize("converted_vault", [FOLDER_TAGS], indirect=True)
+    def test_convert_directory_folder_tags_skip_root_notes(self, converted_vault):
+        """Test that notes at the vault root get no folder tag"""
+        output_dir, _ = converted_vault
         
-        # Convert with folder tags
-        converter_org.convert_directory(
-            input_dir, output_dir, add_folder_tags=True
-        )
+        filename = next(output_dir.glob("*--welcome-to-my-vault__*.org")).name
+        assert filename.endswith('__meta_important.org')
+
+    @pytest.mark.parametrize("converted_vault", [MD_STRUCTURE], indirect=True)
+    def test_convert_directory_preserve_structure(self, converted_vault):
+        """Test that notes stay in their original folders"""
+        output_dir, _ = converted_vault
         
-        # Check output
-        output_files = list(output_dir.glob("*.org"))
-        assert len(output_files) == 1
+        assert next((output_dir / "projects").glob("*--project-alpha__*.md"), None)
+        assert next((output_dir / "daily").glob("*--meeting-notes-2024-01-15.md"), None)
+        assert next(output_dir.glob("*--welcome-to-my-vault__*.md"), None)
+
+    @pytest.mark.parametrize("converted_vault", [MD_STRUCTURE], indirect=True)
+    def test_convert_directory_markdown_header(self, converted_vault):
+        """Test that markdown output starts with a Denote front matter block"""
+        output_dir, _ = converted_vault
         
-        # Check that folder name is in tags
-        filename = output_files[0].name
-        assert 'projects' in filename or 'important' in filename
+        content = next(output_dir.glob("*--welcome-to-my-vault__*.md")).read_text()
+        assert content.startswith("---\ntitle: Welcome to My Vault\ndate: 2024-01-01\n")
 
-    def test_asset_finding(self, converter_org, temp_dir):
+    def test_asset_finding(self, converter_org, tmp_path):
         """Test asset finding logic"""
         # Create vault structure
-        vault_dir = Path(temp_dir) / "vault"
+        vault_dir = tmp_path / "vault"
         vault_dir.mkdir(parents=True, exist_ok=True)
         (vault_dir / ".obsidian").mkdir()
         (vault_dir / "attachments").mkdir()
@@ -371,6 +498,38 @@ tags: [important]
         assert found is not None
         assert found.name == "image.png"
 
+    def test_asset_finding_searches_vault(self, converter_org, tmp_path):
+        """Test that assets outside the usual folders are found via the vault index"""
+        vault_dir = tmp_path / "vault"
+        (vault_dir / ".obsidian").mkdir(parents=True)
+        (vault_dir / "notes").mkdir()
+        (vault_dir / "media" / "2024").mkdir(parents=True)
+
+        asset_file = vault_dir / "media" / "2024" / "Photo.PNG"
+        asset_file.write_bytes(b"fake image data")
+
+        assert converter_org.find_asset("Photo.PNG", vault_dir / "notes") == asset_file
+        # Lookups are case-insensitive, as on Obsidian's default platforms
+        assert converter_org.find_asset("photo.png", vault_dir / "notes") == asset_file
+        assert converter_org.find_asset("missing.png", vault_dir / "notes") is None
+
+    def test_copy_asset_deduplicates_content(self, mutable_converter_org, tmp_path):
+        """Test that identical assets at different paths are copied once"""
+        first = tmp_path / "a" / "image.png"
+        second = tmp_path / "b" / "image.png"
+        for asset_file in (first, second):
+            asset_file.parent.mkdir()
+            asset_file.write_bytes(b"fake image data")
+
+        output_dir = tmp_path / "output"
+        (output_dir / "assets").mkdir(parents=True)
+
+        first_copy = mutable_converter_org.copy_asset(first, output_dir)
+        second_copy = mutable_converter_org.copy_asset(second, output_dir)
+
+        assert first_copy == second_copy
+        assert sum(1 for _ in (output_dir / "assets").iterdir()) == 1
+
     def test_process_assets_ignore(self, converter_org):
         """Test asset processing in ignore mode"""
         converter = ObsidianToDenoteConverter(assets_handling='ignore')
@@ -378,10 +537,10 @@ tags: [important]
         result = converter.process_assets(content, Path("."), Path("."))
         assert result == content  # Should remain unchanged
 
-    def test_edge_cases(self, converter_org, temp_dir):
+    def test_edge_cases(self, converter_org, tmp_path):
         """Test various edge cases"""
         # Test with None title
-        test_file = Path(temp_dir) / "test.md"
+        test_file = tmp_path / "test.md"
         test_file.write_text("")
         
         filename, title, tags, _ = converter_org.generate_denote_filename(
@@ -396,17 +555,19 @@ tags: [important]
             test_file, {'tags': []}, ""
         )
         assert tags == []
-        assert '__' not in filename  # No tags section
+        match = FILENAME_RE.fullmatch(filename)
+        assert match and match.group(3) is None  # No tags section
         
         # Test with string tags instead of list
         filename, title, tags, _ = converter_org.generate_denote_filename(
             test_file, {'tags': 'single-tag'}, ""
         )
         assert tags == ['single-tag']
-        assert '__single-tag' in filename
+        match = FILENAME_RE.fullmatch(filename)
+        assert match and match.group(3) == 'single-tag'
         
         # Test file with meaningful name but content has different headings
-        real_file = Path(temp_dir) / "project-documentation.md"
+        real_file = tmp_path / "project-documentation.md"
         real_content = "## Setup Instructions\n\n# Implementation Details\n\nContent here"
         real_file.write_text(real_content)
         
@@ -422,50 +583,22 @@ tags: [important]
 class TestIntegration:
     """Integration tests for the converter"""
     
-    @pytest.fixture
-    def sample_vault(self, tmp_path):
-        """Create a sample Obsidian vault for testing"""
-        vault = tmp_path / "test_vault"
-        vault.mkdir()
+    @pytest.fixture(scope="session")
+    def sample_vault(self, tmp_path_factory):
+        """Create a sample Obsidian vault for testing (shared, read-only)"""
+        vault = tmp_path_factory.mktemp("test_vault")
         
         # Create .obsidian folder
         (vault / ".obsidian").mkdir()
         
-        # Create some notes
-        (vault / "index.md").write_text("""---
-title: Index
-tags: [main, toc]
----
-# Index
-
-This is the main index linking to [[projects/project1]] and [[daily/2024-01-15]].""")
-        
-        # Create subdirectories
-        (vault / "projects").mkdir()
-        (vault / "daily").mkdir()
-        (vault / "attachments").mkdir()
-        
-        (vault / "projects" / "project1.md").write_text("""---
-title: Project Alpha
-tags: [project, important]
----
-# Project Alpha
-
-See the [[index]] for more info.
-Check the diagram: ![[diagram.png]]""")
-        
-        (vault / "daily" / "2024-01-15.md").write_text("""# Daily Note
-
-- [ ] Task 1
-- [x] Task 2
-
-Worked on [[projects/project1]]""")
-        
-        # Create a fake attachment
-        (vault / "attachments" / "diagram.png").write_bytes(b"fake png data")
+        for relative_path, data in _SAMPLE_VAULT_FILES.items():
+            path = vault / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
         
         return vault
 
+    @pytest.mark.slow
     def test_full_vault_conversion(self, sample_vault, tmp_path):
         """Test converting an entire vault"""
         output_dir = tmp_path / "denote_output"
@@ -493,7 +626,7 @@ Worked on [[projects/project1]]""")
         assets_dir = output_dir / "assets"
         if converter.asset_mapping:
             assert assets_dir.exists()
-            assert len(list(assets_dir.glob("*.png"))) == 1
+            assert sum(1 for _ in assets_dir.glob("*.png")) == 1
         
         # Check content of one file
         index_files = [f for f in org_files if "index" in f.name.lower()]
@@ -501,3 +634,71 @@ Worked on [[projects/project1]]""")
             content = index_files[0].read_text()
             assert "#+title:" in content
             assert "#+filetags:" in content
+
+    @pytest.mark.slow
+    def test_serial_and_parallel_output_match(self, tmp_path):
+        """Test that links resolve the same way whatever the number of workers"""
+        vault = tmp_path / "vault"
+        vault.mkdir()
+        # The notes link to each other, so one is always converted before its target
+        (vault / "alpha.md").write_text("---\ncreated: 2024-01-01\n---\nSee [[zeta]]")
+        (vault / "zeta.md").write_text("---\ncreated: 2024-01-02\n---\nSee [[alpha]]")
+
+        outputs = []
+        for workers in (1, 2):
+            output_dir = tmp_path / f"output_{workers}"
+            converter = ObsidianToDenoteConverter(output_format='org')
+            converter.convert_directory(vault, output_dir, workers=workers)
+            outputs.append({p.name: p.read_text() for p in output_dir.glob("*.org")})
+
+        assert outputs[0] == outputs[1]
+        alpha = outputs[0]["20240101T000000--alpha.org"]
+        zeta = outputs[0]["20240102T000000--zeta.org"]
+        assert "[[file:20240102T000000--zeta.org][zeta]]" in alpha
+        assert "[[file:20240101T000000--alpha.org][alpha]]" in zeta
+
+    @pytest.mark.slow
+    def test_parallel_vault_conversion(self, sample_vault, tmp_path):
+        """Test converting an entire vault with a worker pool"""
+        output_dir = tmp_path / "denote_output"
+        
+        converter = ObsidianToDenoteConverter(
+            output_format='org',
+            assets_handling='copy'
+        )
+        
+        converted = converter.convert_directory(sample_vault, output_dir, workers=2)
+        
+        assert len(converted) == 3
+        org_files = list(output_dir.glob("*.org"))
+        assert len(org_files) == 3
+        
+        # Assets are copied once, by the parent process
+        assert len(converter.asset_mapping) == 1
+        assert sum(1 for _ in (output_dir / "assets").glob("*.png")) == 1
+        
+        # Links resolve even when the target is converted by another worker
+        index_file = next(f for f in org_files if "--index__" in f.name)
+        project_file = next(f for f in org_files if "--project-alpha__" in f.name)
+        assert f"[[file:{index_file.stem}.org][index]]" in project_file.read_text()
+
+    @pytest.mark.slow
+    def test_parallel_conversion_deduplicates_asset_content(self, tmp_path):
+        """Test that identical assets under different names are copied once"""
+        vault = tmp_path / "vault"
+        for name in ("first", "second"):
+            (vault / name).mkdir(parents=True)
+            (vault / name / f"{name}.png").write_bytes(b"same image data")
+            (vault / name / f"{name}.md").write_text(f"![[{name}.png]]")
+        output_dir = tmp_path / "output"
+
+        converter = ObsidianToDenoteConverter(output_format='org', assets_handling='copy')
+        converter.convert_directory(vault, output_dir, workers=2)
+
+        copies = list((output_dir / "assets").iterdir())
+        assert len(copies) == 1
+        # Both notes point at the single copy
+        notes = list(output_dir.glob("*.org"))
+        assert len(notes) == 2
+        for note in notes:
+            assert f"assets/{copies[0].name}" in note.read_text()